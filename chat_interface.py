@@ -5,6 +5,7 @@ Simple Streamlit chat interface for the Local LLM Stack
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from typing import Dict, Any
@@ -13,10 +14,42 @@ from typing import Dict, Any
 API_BASE = "http://192.168.1.30:8001"  # Use the specific IP address
 MODEL_NAME = "Qwen/Qwen2.5-14B-Instruct-AWQ"
 
+# Page styles; chat messages use Streamlit's native chat elements
+CSS_BLOCK = """
+<style>
+.main-header {
+    text-align: center;
+    padding: 1rem 0;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-radius: 10px;
+    margin-bottom: 2rem;
+}
+.status-online {
+    color: #28a745;
+    font-weight: bold;
+}
+.status-offline {
+    color: #dc3545;
+    font-weight: bold;
+}
+</style>
+"""
+
+@st.cache_resource
+def get_http() -> requests.Session:
+    """Get a keep-alive HTTP session shared across Streamlit reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=5, show_spinner=False)
 def check_connection() -> bool:
     """Check if the orchestrator is running and healthy."""
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=5)
+        response = get_http().get(f"{API_BASE}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             return data.get("status") == "healthy"
@@ -24,42 +57,52 @@ def check_connection() -> bool:
         pass
     return False
 
-def send_message(message: str, conversation_history: list = None) -> str:
-    """Send a message to the orchestrator and get response."""
+def stream_message(messages: list):
+    """Send the conversation to the orchestrator and stream back the response tokens."""
     try:
-        # Use conversation history if provided, otherwise start fresh
-        messages = conversation_history if conversation_history else []
-        messages.append({"role": "user", "content": message})
-        
         payload = {
             "model": MODEL_NAME,
             "messages": messages,
-            "temperature": 0.7
+            "temperature": 0.7,
+            "stream": True
         }
         
-        response = requests.post(
+        with get_http().post(
             f"{API_BASE}/chat/completions",
             json=payload,
+            stream=True,
             timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-        else:
-            return f"Error: HTTP {response.status_code} - {response.text}"
+        ) as response:
+            if response.status_code != 200:
+                yield f"Error: HTTP {response.status_code} - {response.text}"
+                return
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if "error" in chunk:
+                    yield f"Error: {chunk['error']}"
+                    return
+                content = chunk["choices"][0].get("delta", {}).get("content")
+                if content:
+                    yield content
             
     except requests.exceptions.Timeout:
-        return "Error: Request timed out. The model might be processing a complex request."
+        yield "Error: Request timed out. The model might be processing a complex request."
     except requests.exceptions.ConnectionError:
-        return "Error: Cannot connect to the orchestrator. Make sure the services are running."
+        yield "Error: Cannot connect to the orchestrator. Make sure the services are running."
     except Exception as e:
-        return f"Error: {str(e)}"
+        yield f"Error: {str(e)}"
 
+@st.cache_data(ttl=60, show_spinner=False)
 def get_available_tools() -> list:
     """Get list of available tools."""
     try:
-        response = requests.get(f"{API_BASE}/tools/schemas", timeout=5)
+        response = get_http().get(f"{API_BASE}/tools/schemas", timeout=5)
         if response.status_code == 200:
             return response.json()
     except:
@@ -75,45 +118,7 @@ def main():
     )
     
     # Custom CSS
-    st.markdown("""
-    <style>
-    .main-header {
-        text-align: center;
-        padding: 1rem 0;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .status-online {
-        color: #28a745;
-        font-weight: bold;
-    }
-    .status-offline {
-        color: #dc3545;
-        font-weight: bold;
-    }
-    .chat-message {
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 10px;
-        border-left: 4px solid;
-    }
-    .user-message {
-        background-color: #e3f2fd;
-        border-left-color: #2196f3;
-    }
-    .assistant-message {
-        background-color: #f3e5f5;
-        border-left-color: #9c27b0;
-    }
-    .error-message {
-        background-color: #ffebee;
-        border-left-color: #f44336;
-        color: #c62828;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(CSS_BLOCK, unsafe_allow_html=True)
     
     # Header
     st.markdown("""
@@ -154,6 +159,8 @@ def main():
         # Quick actions
         st.header("⚡ Quick Actions")
         if st.button("🔄 Refresh Status"):
+            check_connection.clear()
+            get_available_tools.clear()
             st.rerun()
         
         if st.button("🧹 Clear Chat"):
@@ -174,54 +181,34 @@ def main():
     
     # Display chat messages
     for message in st.session_state.messages:
-        if message["role"] == "user":
-            st.markdown(f"""
-            <div class="chat-message user-message">
-                <strong>👤 You:</strong><br>
-                {message["content"]}
-            </div>
-            """, unsafe_allow_html=True)
-        elif message["role"] == "assistant":
-            st.markdown(f"""
-            <div class="chat-message assistant-message">
-                <strong>🤖 Assistant:</strong><br>
-                {message["content"]}
-            </div>
-            """, unsafe_allow_html=True)
-        elif message["role"] == "error":
-            st.markdown(f"""
-            <div class="chat-message error-message">
-                <strong>❌ Error:</strong><br>
-                {message["content"]}
-            </div>
-            """, unsafe_allow_html=True)
+        if message["role"] == "error":
+            with st.chat_message("assistant", avatar="❌"):
+                st.error(message["content"])
+        else:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
     
     # Chat input
     if is_connected:
-        with st.form("chat_form", clear_on_submit=True):
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                user_input = st.text_input(
-                    "Type your message:",
-                    placeholder="Ask me anything...",
-                    label_visibility="collapsed"
-                )
-            with col2:
-                submit_button = st.form_submit_button("Send", use_container_width=True)
+        user_input = st.chat_input("Ask me anything...")
         
-        if submit_button and user_input:
+        if user_input:
             # Add user message
             st.session_state.messages.append({"role": "user", "content": user_input})
+            with st.chat_message("user"):
+                st.markdown(user_input)
+            
+            # Convert Streamlit messages to API format
+            # (the user turn was appended above, so it is already included)
+            api_messages = [
+                {"role": msg["role"], "content": msg["content"]}
+                for msg in st.session_state.messages
+                if msg["role"] in ("user", "assistant")
+            ]
             
-            # Get assistant response
-            with st.spinner("Thinking..."):
-                # Convert Streamlit messages to API format
-                api_messages = []
-                for msg in st.session_state.messages:
-                    if msg["role"] in ["user", "assistant"]:
-                        api_messages.append({"role": msg["role"], "content": msg["content"]})
-                
-                response = send_message(user_input, api_messages)
+            # Stream assistant response as it is generated
+            with st.chat_message("assistant"):
+                response = st.write_stream(stream_message(api_messages))
             
             # Add assistant response
             if response.startswith("Error:"):
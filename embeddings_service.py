@@ -1,13 +1,107 @@
 #!/usr/bin/env python3
 """Simple embeddings service using sentence-transformers."""
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
+import torch
 from sentence_transformers import SentenceTransformer
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
-app = FastAPI()
+# Micro-batching: texts from concurrent requests are coalesced into a
+# single forward pass of up to MAX_BATCH_SIZE items or MAX_BATCH_WAIT seconds.
+MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH", "32"))
+MAX_BATCH_WAIT = float(os.getenv("EMBED_MAX_WAIT_MS", "5")) / 1000
+
+# EMBED_PRECISION: auto (fp16 on CUDA, fp32 on CPU), fp16, int8 (CPU only), fp32
+model_name = os.getenv("MODEL_ID", "all-MiniLM-L6-v2")
+model: SentenceTransformer = None
+
+
+def load_model() -> SentenceTransformer:
+    """Load the embeddings model with the configured device and precision."""
+    # One intra-op thread per worker process; scale out with EMBED_WORKERS
+    # instead so concurrent forward passes do not thrash the CPU cores.
+    # Set here rather than at import time: uvicorn's spawned workers import
+    # this module twice, and interop threads can only be set once.
+    torch.set_num_threads(int(os.getenv("TORCH_THREADS", "1")))
+    torch.set_num_interop_threads(1)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    precision = os.getenv("EMBED_PRECISION", "auto").lower()
+    if precision == "auto":
+        precision = "fp16" if device == "cuda" else "fp32"
+    print(f"Loading embeddings model: {model_name} ({device}, {precision})")
+    loaded = SentenceTransformer(model_name, device=device)
+    if precision == "fp16" and device == "cuda":
+        loaded.half()
+    elif precision == "int8" and device == "cpu":
+        # Dynamic int8 quantization of the Linear layers for CPU inference
+        loaded = torch.quantization.quantize_dynamic(
+            loaded, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    elif precision != "fp32":
+        print(f"Precision {precision} is not supported on {device}, using fp32")
+    print("Model loaded successfully!")
+    return loaded
+
+
+# Pending (text, future) pairs waiting for the batch worker
+embed_queue: asyncio.Queue = None
+
+
+async def batch_worker():
+    """Drain the queue in micro-batches and resolve each caller's future."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await embed_queue.get()]
+        deadline = loop.time() + MAX_BATCH_WAIT
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(embed_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            embeddings = await run_in_threadpool(
+                model.encode,
+                [text for text, _ in batch],
+                batch_size=MAX_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the model and start/stop the micro-batching worker.
+    
+    Runs once per uvicorn worker process, so each worker owns its own model.
+    """
+    global embed_queue, model
+    model = load_model()
+    embed_queue = asyncio.Queue()
+    worker = asyncio.create_task(batch_worker())
+    yield
+    worker.cancel()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -16,12 +110,6 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-# Load the model
-model_name = os.getenv("MODEL_ID", "all-MiniLM-L6-v2")
-print(f"Loading embeddings model: {model_name}")
-model = SentenceTransformer(model_name)
-print("Model loaded successfully!")
-
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -35,12 +123,26 @@ async def embed(data: dict):
         return {"error": "No inputs provided"}
     
     try:
-        embeddings = model.encode(inputs)
-        return {
-            "data": [{"embedding": emb.tolist()} for emb in embeddings]
-        }
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in inputs:
+            future = loop.create_future()
+            embed_queue.put_nowait((text, future))
+            futures.append(future)
+
+        embeddings = await asyncio.gather(*futures)
+        # Returned directly so FastAPI skips jsonable_encoder (which cannot
+        # handle numpy arrays); ORJSONResponse serializes them natively.
+        return ORJSONResponse({
+            "data": [{"embedding": emb} for emb in embeddings]
+        })
     except Exception as e:
         return {"error": str(e)}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8081)
+    uvicorn.run(
+        "embeddings_service:app",
+        host="0.0.0.0",
+        port=8081,
+        workers=int(os.getenv("EMBED_WORKERS", "2"))
+    )
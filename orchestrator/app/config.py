@@ -12,6 +12,7 @@ class Settings(BaseSettings):
     openai_compat_url: str = "http://localhost:8000/v1"
     embed_url: str = "http://localhost:8081"
     qdrant_url: str = "http://localhost:6333"
+    qdrant_grpc_port: int = 6334
     
     # Langfuse configuration
     langfuse_host: str = "http://localhost:3000"
@@ -24,6 +25,9 @@ class Settings(BaseSettings):
     
     # Tool configuration
     tools_dir: str = "/app/tools"
+    # Send tool schemas to vLLM (needs vLLM started with tool calling enabled);
+    # streamed requests then run the full agent and arrive as a single chunk
+    tool_calling: bool = False
     
     class Config:
         env_file = ".env"
@@ -32,12 +36,14 @@ class Settings(BaseSettings):
             'openai_compat_url': {'env': 'OPENAI_COMPAT_URL'},
             'embed_url': {'env': 'EMBED_URL'},
             'qdrant_url': {'env': 'QDRANT_URL'},
+            'qdrant_grpc_port': {'env': 'QDRANT_GRPC_PORT'},
             'langfuse_host': {'env': 'LANGFUSE_HOST'},
             'langfuse_public_key': {'env': 'LANGFUSE_PUBLIC_KEY'},
             'langfuse_secret_key': {'env': 'LANGFUSE_SECRET_KEY'},
             'orchestrator_port': {'env': 'ORCHESTRATOR_PORT'},
             'log_level': {'env': 'LOG_LEVEL'},
-            'tools_dir': {'env': 'TOOLS_DIR'}
+            'tools_dir': {'env': 'TOOLS_DIR'},
+            'tool_calling': {'env': 'TOOL_CALLING'}
         }
 
 
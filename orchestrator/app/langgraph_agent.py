@@ -1,17 +1,25 @@
 """LangGraph agent implementation."""
 
-import json
+import asyncio
+import logging
 import time
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, TypedDict
+import orjson
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
+from .config import settings
 from .llm_client import LLMClient
-from .vector_store import VectorStore
+from .vector_store import get_vector_store
 from .tools import ToolRegistry
 from .models import ChatMessage
 
+logger = logging.getLogger(__name__)
+
+# Marks system messages carrying retrieved context (see _retrieve_context)
+CONTEXT_PREFIX = "Relevant context:\n"
+
 
 class AgentState(TypedDict):
     """State for the LangGraph agent."""
@@ -27,7 +35,7 @@ class LangGraphAgent:
     
     def __init__(self):
         self.llm_client = LLMClient()
-        self.vector_store = VectorStore()
+        self.vector_store = get_vector_store()
         self.tool_registry = ToolRegistry()
         self.graph = self._build_graph()
     
@@ -74,18 +82,27 @@ class LangGraphAgent:
     async def _retrieve_context(self, state: AgentState) -> AgentState:
         """Retrieve relevant context from vector store."""
         messages = state["messages"]
+        
+        # Drop context injected on an earlier pass so it never accumulates
+        messages[:] = [
+            msg for msg in messages
+            if not (msg["role"] == "system" and msg["content"].startswith(CONTEXT_PREFIX))
+        ]
+        
         if messages:
             last_message = messages[-1]["content"]
             try:
                 # Search for relevant documents
-                results = await self.vector_store.search(last_message, limit=3)
+                results = list(await self.vector_store.search(last_message, limit=3))
                 if results:
-                    context = "\n".join([r["text"] for r in results])
-                    # Add context to the last message
-                    messages[-1]["content"] = f"Context: {context}\n\nQuery: {last_message}"
-                    state["messages"] = messages
+                    context = "\n".join(r["text"] for r in results)
+                    # Add context as its own message right before the query
+                    messages.insert(-1, {
+                        "role": "system",
+                        "content": f"{CONTEXT_PREFIX}{context}"
+                    })
             except Exception as e:
-                print(f"Warning: Context retrieval failed: {e}")
+                logger.debug("Context retrieval failed: %s", e)
         
         state["current_step"] = "context_retrieved"
         return state
@@ -93,12 +110,14 @@ class LangGraphAgent:
     async def _generate_response(self, state: AgentState) -> AgentState:
         """Generate response using the LLM."""
         messages = state["messages"]
-        tool_schemas = self.tool_registry.get_tool_schemas()
+        tools_json = (
+            self.tool_registry.get_tool_schemas_json() if settings.tool_calling else None
+        )
         
         try:
             response = await self.llm_client.chat_completion(
                 messages=messages,
-                # tools=tool_schemas,  # Temporarily disabled until vLLM tool calling is configured
+                tools_json=tools_json,
                 temperature=0.7
             )
             
@@ -113,7 +132,6 @@ class LangGraphAgent:
                 "tool_calls": message.get("tool_calls", [])
             }
             messages.append(ai_message)
-            state["messages"] = messages
             
             # Store tool calls if any
             if message.get("tool_calls"):
@@ -127,7 +145,6 @@ class LangGraphAgent:
                 "content": f"Error generating response: {str(e)}"
             }
             messages.append(error_message)
-            state["messages"] = messages
             state["current_step"] = "error"
         
         return state
@@ -138,39 +155,42 @@ class LangGraphAgent:
             return "tools"
         return "finalize"
     
+    async def _run_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single tool call and build its tool message."""
+        tool_name = tool_call["function"]["name"]
+        arguments = orjson.loads(tool_call["function"]["arguments"])
+        tool_call_id = tool_call["id"]
+        
+        result = await self.tool_registry.execute_tool(
+            tool_name, tool_call_id, arguments
+        )
+        
+        return {
+            "role": "tool",
+            "content": orjson.dumps(result.result).decode() if result.result else result.error,
+            "tool_call_id": tool_call_id
+        }
+    
     async def _execute_tools(self, state: AgentState) -> AgentState:
-        """Execute tool calls."""
+        """Execute tool calls concurrently."""
         tool_calls = state.get("tool_calls", [])
         messages = state["messages"]
         
-        for tool_call in tool_calls:
-            try:
-                tool_name = tool_call["function"]["name"]
-                arguments = json.loads(tool_call["function"]["arguments"])
-                tool_call_id = tool_call["id"]
-                
-                # Execute the tool
-                result = await self.tool_registry.execute_tool(
-                    tool_name, tool_call_id, arguments
-                )
-                
-                # Add tool result to messages
-                tool_message = {
-                    "role": "tool",
-                    "content": json.dumps(result.result) if result.result else result.error,
-                    "tool_call_id": tool_call_id
-                }
-                messages.append(tool_message)
-                
-            except Exception as e:
-                error_message = {
+        results = await asyncio.gather(
+            *(self._run_tool_call(tool_call) for tool_call in tool_calls),
+            return_exceptions=True
+        )
+        
+        # Append in the original order so tool_call_id pairing is preserved
+        for tool_call, result in zip(tool_calls, results):
+            if isinstance(result, Exception):
+                result = {
                     "role": "tool",
-                    "content": f"Tool execution error: {str(e)}",
+                    "content": f"Tool execution error: {str(result)}",
                     "tool_call_id": tool_call.get("id", "unknown")
                 }
-                messages.append(error_message)
+            messages.append(result)
         
-        state["messages"] = messages
         state["tool_calls"] = []  # Clear tool calls
         state["iteration_count"] = state.get("iteration_count", 0) + 1
         state["current_step"] = "tools_executed"
@@ -202,15 +222,26 @@ class LangGraphAgent:
             iteration_count=0
         )
         
+        # When no tools are sent to the LLM there can be no tool calls, so the
+        # graph is a straight line: skip the no-op analyze/finalize nodes and
+        # the LangGraph dispatch overhead.
+        fast = max_iterations == 0 or not settings.tool_calling
+        
         try:
-            final_state = await self.graph.ainvoke(initial_state)
+            if fast:
+                final_state = await self._retrieve_context(initial_state)
+                final_state = await self._generate_response(final_state)
+            else:
+                final_state = await self.graph.ainvoke(initial_state)
             
             # Extract the final response
             final_messages = final_state["messages"]
-            ai_messages = [msg for msg in final_messages if msg["role"] == "assistant"]
+            last_ai_message = next(
+                (msg for msg in reversed(final_messages) if msg["role"] == "assistant"),
+                None
+            )
             
-            if ai_messages:
-                last_ai_message = ai_messages[-1]
+            if last_ai_message is not None:
                 return {
                     "response": last_ai_message["content"],
                     "tool_calls": last_ai_message.get("tool_calls", []),
@@ -231,10 +262,76 @@ class LangGraphAgent:
                 "status": "error"
             }
     
-    async def health_check(self) -> Dict[str, bool]:
-        """Check health of all components."""
+    async def stream_request(
+        self,
+        messages: List[ChatMessage],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a response as server-sent events.
+        
+        Without tool calling the graph is bypassed: context is retrieved once
+        and vLLM's SSE bytes are forwarded as-is. With ``TOOL_CALLING`` enabled
+        the full graph runs instead and its final answer is sent as one chunk.
+        """
+        if settings.tool_calling:
+            result = await self.process_request(messages)
+            created = int(time.time())
+            chunk = {
+                "id": f"chatcmpl-{created}",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model or "Qwen/Qwen2.5-14B-Instruct-AWQ",
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": result["response"]},
+                    "finish_reason": "stop"
+                }]
+            }
+            yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+            return
+        
+        state = AgentState(
+            messages=[
+                {"role": msg.role, "content": msg.content}
+                for msg in messages
+            ],
+            tool_calls=[],
+            current_step="start",
+            max_iterations=0,
+            iteration_count=0
+        )
+        
+        try:
+            await self._retrieve_context(state)
+            async for chunk in self.llm_client.stream_chat_completion(
+                messages=state["messages"],
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens
+            ):
+                yield chunk
+        except Exception as e:
+            # Leading blank line terminates any partially forwarded event
+            error = orjson.dumps({"error": f"Agent streaming failed: {str(e)}"})
+            yield b"\n\ndata: " + error + b"\n\n"
+            yield b"data: [DONE]\n\n"
+    
+    async def health_check(self, timeout: float = 0.5) -> Dict[str, bool]:
+        """Check health of all components concurrently.
+        
+        Each probe is bounded by ``timeout`` seconds so a single slow
+        dependency cannot stall the whole check.
+        """
+        llm_ok, vs_ok = await asyncio.gather(
+            asyncio.wait_for(self.llm_client.health_check(), timeout),
+            asyncio.wait_for(self.vector_store.health_check(), timeout),
+            return_exceptions=True
+        )
         return {
-            "llm": await self.llm_client.health_check(),
-            "vector_store": await self.vector_store.health_check()
+            "llm": llm_ok is True,
+            "vector_store": vs_ok is True
         }
 
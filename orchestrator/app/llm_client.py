@@ -2,26 +2,44 @@
 
 import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 import httpx
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
+import orjson
 
 from .config import settings
 from .models import ChatRequest, ChatResponse
 
 
+# Shared connection pool for every LLMClient so vLLM calls reuse keep-alive
+# connections instead of paying a new handshake per client/request.
+_shared_client = httpx.AsyncClient(
+    base_url=settings.openai_compat_url,
+    timeout=60.0,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 class LLMClient:
     """Client for communicating with the vLLM server."""
     
     def __init__(self):
         self.base_url = settings.openai_compat_url
-        self.client = httpx.AsyncClient(timeout=60.0)
-        self.langchain_client = ChatOpenAI(
-            base_url=self.base_url,
-            api_key="dummy",  # vLLM doesn't require real API key
-            model="Qwen/Qwen2.5-14B-Instruct-AWQ"
-        )
+        self.client = _shared_client
+        self._langchain_client = None
+    
+    @property
+    def langchain_client(self):
+        """LangChain chat client, created (and imported) on first use."""
+        if self._langchain_client is None:
+            from langchain_openai import ChatOpenAI
+            self._langchain_client = ChatOpenAI(
+                base_url=self.base_url,
+                api_key="dummy",  # vLLM doesn't require real API key
+                model="Qwen/Qwen2.5-14B-Instruct-AWQ"
+            )
+        return self._langchain_client
     
     async def health_check(self) -> bool:
         """Check if the LLM server is healthy."""
@@ -31,17 +49,16 @@ class LLMClient:
         except Exception:
             return False
     
-    async def chat_completion(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        model: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-        tools: Optional[List[Dict[str, Any]]] = None,
-        stream: bool = False
+        model: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        tools: Optional[List[Dict[str, Any]]],
+        stream: bool
     ) -> Dict[str, Any]:
-        """Send chat completion request to vLLM."""
-        
+        """Build the request body for a chat completion."""
         payload = {
             "model": model or "Qwen/Qwen2.5-14B-Instruct-AWQ",
             "messages": messages,
@@ -55,22 +72,85 @@ class LLMClient:
         if tools:
             payload["tools"] = tools
         
+        return payload
+    
+    def _encode_body(
+        self,
+        payload: Dict[str, Any],
+        tools_json: Optional[bytes]
+    ) -> bytes:
+        """Serialize the payload, splicing in pre-encoded tool schemas."""
+        body = orjson.dumps(payload)
+        if tools_json:
+            # payload is a non-empty object: replace its closing brace
+            body = body[:-1] + b',"tools":' + tools_json + b"}"
+        return body
+    
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tools_json: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """Send chat completion request to vLLM.
+        
+        ``tools_json`` is an already-encoded tool schema array (see
+        ToolRegistry.get_tool_schemas_json) spliced into the body as-is.
+        """
+        
+        payload = self._build_payload(
+            messages, model, temperature, max_tokens, tools, stream=False
+        )
+        
         try:
             response = await self.client.post(
                 f"{self.base_url}/chat/completions",
-                json=payload
+                content=self._encode_body(payload, tools_json),
+                headers=_JSON_HEADERS
             )
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
             raise Exception(f"LLM request failed: {e}")
     
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tools_json: Optional[bytes] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a chat completion from vLLM, yielding raw SSE bytes."""
+        
+        payload = self._build_payload(
+            messages, model, temperature, max_tokens, tools, stream=True
+        )
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                content=self._encode_body(payload, tools_json),
+                headers=_JSON_HEADERS
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except httpx.HTTPError as e:
+            raise Exception(f"LLM request failed: {e}")
+    
     async def chat_with_langchain(
         self,
         messages: List[str],
         system_message: Optional[str] = None
     ) -> str:
         """Use LangChain client for simpler chat interactions."""
+        from langchain.schema import HumanMessage, SystemMessage
         
         langchain_messages = []
         
@@ -87,6 +167,6 @@ class LLMClient:
             raise Exception(f"LangChain chat failed: {e}")
     
     async def close(self):
-        """Close the HTTP client."""
+        """Close the shared HTTP client (call once on application shutdown)."""
         await self.client.aclose()
 
@@ -5,15 +5,17 @@ import time
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import msgspec
 import uvicorn
 
 from .config import settings
-from .models import ChatRequest, ChatResponse, ChatMessage
+from . import models_fast
+from .models import ChatRequest, ChatMessage
 from .langgraph_agent import LangGraphAgent
 from .llm_client import LLMClient
-from .vector_store import VectorStore
 
 
 # Configure logging
@@ -23,6 +25,34 @@ logger = logging.getLogger(__name__)
 # Global agent instance
 agent: LangGraphAgent = None
 
+# Last /health result, reused for HEALTH_CACHE_TTL seconds so frequent
+# probing does not fan out to vLLM and Qdrant on every request
+HEALTH_CACHE_TTL = 2.0
+_health_cache: Dict[str, Any] = {"expires": 0.0, "result": None}
+
+
+def _openapi_body(struct_type: type) -> Dict[str, Any]:
+    """OpenAPI requestBody for a msgspec Struct, with its $defs inlined."""
+    schema = msgspec.json.schema(struct_type)
+    defs = schema.pop("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None:
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": resolve(schema)}}
+        }
+    }
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,19 +66,21 @@ async def lifespan(app: FastAPI):
     
     # Health check
     health = await agent.health_check()
-    logger.info(f"Health check: {health}")
+    logger.info("Health check: %s", health)
     
     # Warm up the model with a dummy request
     try:
-        await warm_up_model()
+        await warm_up_model(agent.llm_client)
         logger.info("Model warmed up successfully")
     except Exception as e:
-        logger.warning(f"Model warm-up failed: {e}")
+        logger.warning("Model warm-up failed: %s", e)
     
     yield
     
     # Cleanup
     logger.info("Shutting down orchestrator...")
+    await agent.llm_client.close()
+    await agent.vector_store.aclose()
 
 
 # Create FastAPI app
@@ -56,7 +88,8 @@ app = FastAPI(
     title="Local LLM Orchestrator",
     description="Orchestrator for local LLM with tool calling capabilities",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -69,17 +102,15 @@ app.add_middleware(
 )
 
 
-async def warm_up_model():
-    """Warm up the model with a dummy request."""
+async def warm_up_model(llm_client: LLMClient):
+    """Warm up the model with a dummy request on the shared client."""
     try:
-        llm_client = LLMClient()
         await llm_client.chat_completion(
             messages=[{"role": "user", "content": "Hello"}],
             max_tokens=10
         )
-        await llm_client.close()
     except Exception as e:
-        logger.warning(f"Model warm-up failed: {e}")
+        logger.warning("Model warm-up failed: %s", e)
 
 
 @app.get("/")
@@ -94,46 +125,72 @@ async def health_check():
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
+    now = time.monotonic()
+    if _health_cache["result"] is not None and now < _health_cache["expires"]:
+        return _health_cache["result"]
+    
     health = await agent.health_check()
-    return {
+    result = {
         "status": "healthy" if all(health.values()) else "unhealthy",
         "components": health,
         "timestamp": time.time()
     }
+    _health_cache["expires"] = now + HEALTH_CACHE_TTL
+    _health_cache["result"] = result
+    return result
 
 
 @app.get("/models")
 async def list_models():
     """List available models."""
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+    
     try:
-        llm_client = LLMClient()
-        response = await llm_client.client.get(f"{llm_client.base_url}/models")
-        await llm_client.close()
+        response = await agent.llm_client.client.get(
+            f"{agent.llm_client.base_url}/models"
+        )
         return response.json()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list models: {e}")
 
 
-@app.post("/chat/completions")
-async def chat_completions(request: ChatRequest):
+# The body is decoded by hand with msgspec, so its schema is exported
+# explicitly to keep it in the OpenAPI docs
+@app.post("/chat/completions", openapi_extra=_openapi_body(models_fast.ChatRequest))
+async def chat_completions(raw_request: Request):
     """Chat completions endpoint."""
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
+    # Decode and validate the body in one pass with msgspec
     try:
-        # Convert request to ChatMessage objects
-        messages = [
-            ChatMessage(role=msg.role, content=msg.content)
-            for msg in request.messages
-        ]
+        request = msgspec.json.decode(
+            await raw_request.body(), type=models_fast.ChatRequest
+        )
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    try:
+        if request.stream:
+            return StreamingResponse(
+                agent.stream_request(
+                    request.messages,
+                    model=request.model,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens
+                ),
+                media_type="text/event-stream"
+            )
         
         # Process through the agent
-        result = await agent.process_request(messages)
+        result = await agent.process_request(request.messages)
         
         # Create response in OpenAI format
-        response = ChatResponse(
-            id=f"chatcmpl-{int(time.time())}",
-            created=int(time.time()),
+        created = int(time.time())
+        response = models_fast.ChatResponse(
+            id=f"chatcmpl-{created}",
+            created=created,
             model=request.model or "Qwen/Qwen2.5-14B-Instruct-AWQ",
             choices=[{
                 "index": 0,
@@ -145,10 +202,13 @@ async def chat_completions(request: ChatRequest):
             }]
         )
         
-        return response.dict()
+        return Response(
+            content=msgspec.json.encode(response),
+            media_type="application/json"
+        )
         
     except Exception as e:
-        logger.error(f"Chat completion failed: {e}")
+        logger.error("Chat completion failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Chat completion failed: {e}")
 
 
@@ -178,7 +238,7 @@ async def simple_chat(request: Dict[str, Any]):
         }
         
     except Exception as e:
-        logger.error(f"Simple chat failed: {e}")
+        logger.error("Simple chat failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Chat failed: {e}")
 
 
@@ -200,10 +260,10 @@ async def execute_tool(request: Dict[str, Any]):
             tool_name, tool_call_id, arguments
         )
         
-        return result.dict()
+        return result
         
     except Exception as e:
-        logger.error(f"Tool execution failed: {e}")
+        logger.error("Tool execution failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {e}")
 
 
@@ -213,7 +273,10 @@ async def get_tool_schemas():
     if agent is None:
         raise HTTPException(status_code=503, detail="Agent not initialized")
     
-    return agent.tool_registry.get_tool_schemas()
+    return Response(
+        content=agent.tool_registry.get_tool_schemas_json(),
+        media_type="application/json"
+    )
 
 
 if __name__ == "__main__":
@@ -221,7 +284,9 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=settings.orchestrator_port,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=False,
         log_level=settings.log_level.lower()
     )
 
@@ -1,23 +1,28 @@
 """Data models for the orchestrator."""
 
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class ChatMessage(BaseModel):
+class _FrozenModel(BaseModel):
+    """Immutable base for the DTOs; unknown fields are rejected."""
+    model_config = ConfigDict(frozen=True, extra="forbid", validate_assignment=False)
+
+
+class ChatMessage(_FrozenModel):
     """Chat message model."""
     role: str = Field(..., description="Message role (user, assistant, system)")
     content: str = Field(..., description="Message content")
 
 
-class ToolCall(BaseModel):
+class ToolCall(_FrozenModel):
     """Tool call model."""
     id: str = Field(..., description="Tool call ID")
     type: str = Field(default="function", description="Tool call type")
     function: Dict[str, Any] = Field(..., description="Function details")
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(_FrozenModel):
     """Chat request model."""
     messages: List[ChatMessage] = Field(..., description="Chat messages")
     model: Optional[str] = Field(default=None, description="Model to use")
@@ -26,14 +31,14 @@ class ChatRequest(BaseModel):
     stream: Optional[bool] = Field(default=False, description="Stream response")
 
 
-class ToolResponse(BaseModel):
+class ToolResponse(_FrozenModel):
     """Tool response model."""
     tool_call_id: str = Field(..., description="Tool call ID")
     result: Any = Field(..., description="Tool execution result")
     error: Optional[str] = Field(default=None, description="Error message if any")
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(_FrozenModel):
     """Chat response model."""
     id: str = Field(..., description="Response ID")
     object: str = Field(default="chat.completion", description="Object type")
@@ -43,7 +48,7 @@ class ChatResponse(BaseModel):
     usage: Optional[Dict[str, int]] = Field(default=None, description="Token usage")
 
 
-class ToolSchema(BaseModel):
+class ToolSchema(_FrozenModel):
     """Tool schema model."""
     type: str = Field(default="function", description="Tool type")
     function: Dict[str, Any] = Field(..., description="Function schema")
@@ -0,0 +1,63 @@
+"""msgspec models for the hot request/response path.
+
+These mirror the pydantic models in ``models.py`` field for field. Decoding
+into them parses, validates and builds the structs in a single pass.
+"""
+
+from typing import Any, Dict, List, Optional
+import msgspec
+
+
+class ChatMessage(msgspec.Struct):
+    """Chat message model."""
+    role: str
+    content: str
+
+
+class ToolCall(msgspec.Struct, kw_only=True):
+    """Tool call model."""
+    id: str
+    type: str = "function"
+    function: Dict[str, Any]
+
+
+class ChatRequest(msgspec.Struct):
+    """Chat request model."""
+    messages: List[ChatMessage]
+    model: Optional[str] = None
+    temperature: Optional[float] = 0.7
+    max_tokens: Optional[int] = None
+    stream: Optional[bool] = False
+
+
+class ToolResponse(msgspec.Struct):
+    """Tool response model."""
+    tool_call_id: str
+    result: Any
+    error: Optional[str] = None
+
+
+class ChatResponse(msgspec.Struct, kw_only=True):
+    """Chat response model."""
+    id: str
+    object: str = "chat.completion"
+    created: int
+    model: str
+    choices: List[Dict[str, Any]]
+    usage: Optional[Dict[str, int]] = None
+
+
+class ToolSchema(msgspec.Struct, kw_only=True):
+    """Tool schema model."""
+    type: str = "function"
+    function: Dict[str, Any]
+
+
+class EmbedItem(msgspec.Struct):
+    """Single embedding returned by the embeddings service."""
+    embedding: List[float]
+
+
+class EmbedResponse(msgspec.Struct):
+    """Embeddings service /embed response."""
+    data: List[EmbedItem]
@@ -1,15 +1,189 @@
 """Tool implementations for the orchestrator."""
 
+import asyncio
 import json
 import os
 import subprocess
 import tempfile
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
+import orjson
 
 from .models import ToolResponse
 
 
+# Tool schemas are static, so they are built once at import and shared
+_TOOL_SCHEMAS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_map",
+            "description": "Fetch a table, map, or data structure by key",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "key": {
+                        "type": "string",
+                        "description": "The key to fetch"
+                    }
+                },
+                "required": ["key"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "apply_patch",
+            "description": "Apply a code or data patch and run tests",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "repo": {
+                        "type": "string",
+                        "description": "Repository or project name"
+                    },
+                    "patch": {
+                        "type": "string",
+                        "description": "The patch to apply"
+                    }
+                },
+                "required": ["repo", "patch"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_logs",
+            "description": "Search through log files for patterns",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "pattern": {
+                        "type": "string",
+                        "description": "Search pattern or regex"
+                    },
+                    "log_path": {
+                        "type": "string",
+                        "description": "Path to log file or directory"
+                    }
+                },
+                "required": ["pattern"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "run_tests",
+            "description": "Run unit tests for a project",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "project_path": {
+                        "type": "string",
+                        "description": "Path to the project"
+                    },
+                    "test_pattern": {
+                        "type": "string",
+                        "description": "Test pattern to run"
+                    }
+                },
+                "required": ["project_path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "file_operations",
+            "description": "Perform file operations (read, write, list)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "operation": {
+                        "type": "string",
+                        "enum": ["read", "write", "list", "delete"],
+                        "description": "File operation to perform"
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "File or directory path"
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "Content to write (for write operation)"
+                    }
+                },
+                "required": ["operation", "path"]
+            }
+        }
+    }
+]
+
+
+# Pre-encoded schemas, spliced directly into vLLM request and HTTP bodies
+_TOOL_SCHEMAS_JSON: bytes = orjson.dumps(_TOOL_SCHEMAS)
+
+
+def _do_read(path_obj: Path, content: Optional[str]) -> Dict[str, Any]:
+    """Read a file."""
+    if not path_obj.exists():
+        return {"error": f"File not found: {path_obj}"}
+    data = path_obj.read_bytes()
+    return {"content": data.decode(), "size": len(data)}
+
+
+def _do_write(path_obj: Path, content: Optional[str]) -> Dict[str, Any]:
+    """Write content to a file."""
+    if content is None:
+        return {"error": "Content required for write operation"}
+    path_obj.write_text(content)
+    return {"message": f"File written: {path_obj}", "size": len(content)}
+
+
+def _do_list(path_obj: Path, content: Optional[str]) -> Dict[str, Any]:
+    """List a directory."""
+    if not path_obj.exists():
+        return {"error": f"Path not found: {path_obj}"}
+    if not path_obj.is_dir():
+        return {"error": "Path is not a directory"}
+    # scandir yields names without a per-entry stat
+    with os.scandir(path_obj) as entries:
+        files = [entry.name for entry in entries]
+    return {"files": files, "count": len(files)}
+
+
+def _do_delete(path_obj: Path, content: Optional[str]) -> Dict[str, Any]:
+    """Delete a file."""
+    if not path_obj.exists():
+        return {"error": f"File not found: {path_obj}"}
+    path_obj.unlink()
+    return {"message": f"File deleted: {path_obj}"}
+
+
+# file_operations handlers by operation name
+_FILE_OPS: Dict[str, Callable[[Path, Optional[str]], Dict[str, Any]]] = {
+    "read": _do_read,
+    "write": _do_write,
+    "list": _do_list,
+    "delete": _do_delete
+}
+
+
+def _run_file_op(
+    handler: Callable[[Path, Optional[str]], Dict[str, Any]],
+    path: str,
+    content: Optional[str]
+) -> Dict[str, Any]:
+    """Run a blocking file handler (via asyncio.to_thread)."""
+    try:
+        return handler(Path(path), content)
+    except Exception as e:
+        return {"error": str(e)}
+
+
 class ToolRegistry:
     """Registry for available tools."""
     
@@ -26,117 +200,29 @@ class ToolRegistry:
             "run_tests": self.run_tests,
             "file_operations": self.file_operations
         }
+        # Per-tool callers that read the arguments dict directly instead of
+        # going through generic **arguments keyword binding
+        self._trampolines = {
+            "get_map": lambda a: self.get_map(a["key"]),
+            "apply_patch": lambda a: self.apply_patch(a["repo"], a["patch"]),
+            "search_logs": lambda a: self.search_logs(a["pattern"], a.get("log_path")),
+            "run_tests": lambda a: self.run_tests(a["project_path"], a.get("test_pattern")),
+            "file_operations": lambda a: self.file_operations(
+                a["operation"], a["path"], a.get("content")
+            )
+        }
+    
+    def reload(self):
+        """Re-register tools."""
+        self._register_default_tools()
     
     def get_tool_schemas(self) -> List[Dict[str, Any]]:
-        """Get tool schemas for the LLM."""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_map",
-                    "description": "Fetch a table, map, or data structure by key",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "key": {
-                                "type": "string",
-                                "description": "The key to fetch"
-                            }
-                        },
-                        "required": ["key"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "apply_patch",
-                    "description": "Apply a code or data patch and run tests",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "repo": {
-                                "type": "string",
-                                "description": "Repository or project name"
-                            },
-                            "patch": {
-                                "type": "string",
-                                "description": "The patch to apply"
-                            }
-                        },
-                        "required": ["repo", "patch"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_logs",
-                    "description": "Search through log files for patterns",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "pattern": {
-                                "type": "string",
-                                "description": "Search pattern or regex"
-                            },
-                            "log_path": {
-                                "type": "string",
-                                "description": "Path to log file or directory"
-                            }
-                        },
-                        "required": ["pattern"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "run_tests",
-                    "description": "Run unit tests for a project",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "project_path": {
-                                "type": "string",
-                                "description": "Path to the project"
-                            },
-                            "test_pattern": {
-                                "type": "string",
-                                "description": "Test pattern to run"
-                            }
-                        },
-                        "required": ["project_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "file_operations",
-                    "description": "Perform file operations (read, write, list)",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "operation": {
-                                "type": "string",
-                                "enum": ["read", "write", "list", "delete"],
-                                "description": "File operation to perform"
-                            },
-                            "path": {
-                                "type": "string",
-                                "description": "File or directory path"
-                            },
-                            "content": {
-                                "type": "string",
-                                "description": "Content to write (for write operation)"
-                            }
-                        },
-                        "required": ["operation", "path"]
-                    }
-                }
-            }
-        ]
+        """Get tool schemas for the LLM (shared; callers must not mutate)."""
+        return _TOOL_SCHEMAS
+    
+    def get_tool_schemas_json(self) -> bytes:
+        """Get the tool schemas as pre-encoded JSON bytes."""
+        return _TOOL_SCHEMAS_JSON
     
     async def execute_tool(
         self,
@@ -145,22 +231,36 @@ class ToolRegistry:
         arguments: Dict[str, Any]
     ) -> ToolResponse:
         """Execute a tool and return the response."""
+        # ToolResponse fields come from our own code, never from user JSON,
+        # so validation is skipped with model_construct.
         try:
-            if tool_name not in self.tools:
-                return ToolResponse(
+            call = self._trampolines.get(tool_name)
+            if call is None:
+                return ToolResponse.model_construct(
                     tool_call_id=tool_call_id,
                     result=None,
                     error=f"Unknown tool: {tool_name}"
                 )
             
-            result = await self.tools[tool_name](**arguments)
-            return ToolResponse(
+            # Arguments are looked up when the caller runs, before the tool
+            # body starts, so a KeyError here can only be a missing argument
+            try:
+                coro = call(arguments)
+            except KeyError as e:
+                return ToolResponse.model_construct(
+                    tool_call_id=tool_call_id,
+                    result=None,
+                    error=f"Missing required argument: {e}"
+                )
+            
+            result = await coro
+            return ToolResponse.model_construct(
                 tool_call_id=tool_call_id,
                 result=result,
                 error=None
             )
         except Exception as e:
-            return ToolResponse(
+            return ToolResponse.model_construct(
                 tool_call_id=tool_call_id,
                 result=None,
                 error=str(e)
@@ -231,41 +331,8 @@ class ToolRegistry:
         path: str,
         content: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Perform file operations."""
-        try:
-            path_obj = Path(path)
-            
-            if operation == "read":
-                if not path_obj.exists():
-                    return {"error": f"File not found: {path}"}
-                with open(path_obj, 'r') as f:
-                    return {"content": f.read(), "size": path_obj.stat().st_size}
-            
-            elif operation == "write":
-                if content is None:
-                    return {"error": "Content required for write operation"}
-                with open(path_obj, 'w') as f:
-                    f.write(content)
-                return {"message": f"File written: {path}", "size": len(content)}
-            
-            elif operation == "list":
-                if not path_obj.exists():
-                    return {"error": f"Path not found: {path}"}
-                if path_obj.is_dir():
-                    files = [f.name for f in path_obj.iterdir()]
-                    return {"files": files, "count": len(files)}
-                else:
-                    return {"error": "Path is not a directory"}
-            
-            elif operation == "delete":
-                if not path_obj.exists():
-                    return {"error": f"File not found: {path}"}
-                path_obj.unlink()
-                return {"message": f"File deleted: {path}"}
-            
-            else:
-                return {"error": f"Unknown operation: {operation}"}
-                
-        except Exception as e:
-            return {"error": str(e)}
-
+        """Perform file operations in a worker thread."""
+        handler = _FILE_OPS.get(operation)
+        if handler is None:
+            return {"error": f"Unknown operation: {operation}"}
+        return await asyncio.to_thread(_run_file_op, handler, path, content)
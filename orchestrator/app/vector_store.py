@@ -1,29 +1,59 @@
 """Vector store client for Qdrant."""
 
+import asyncio
 import json
-from typing import Any, Dict, List, Optional
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, VectorParams, PointStruct
 from sentence_transformers import SentenceTransformer
 import httpx
+import msgspec
+import numpy as np
 
 from .config import settings
+from .models_fast import EmbedResponse
+
+logger = logging.getLogger(__name__)
+
+# Concurrent embed_text calls are coalesced into one /embed request of up
+# to EMBED_MAX_BATCH texts, waiting at most EMBED_MAX_WAIT seconds.
+EMBED_MAX_BATCH = 32
+EMBED_MAX_WAIT = 0.005
+
+# Number of query embeddings kept in the search LRU cache
+EMBED_CACHE_SIZE = 1024
 
 
 class VectorStore:
     """Vector store client for Qdrant."""
     
     def __init__(self):
-        self.qdrant_client = QdrantClient(url=settings.qdrant_url)
+        # gRPC sends vectors as packed floats instead of JSON numbers
+        self.qdrant_client = QdrantClient(
+            url=settings.qdrant_url,
+            prefer_grpc=True,
+            grpc_port=settings.qdrant_grpc_port
+        )
         self.embed_url = settings.embed_url
+        self._http = httpx.AsyncClient(
+            base_url=settings.embed_url,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_worker: Optional[asyncio.Task] = None
+        self._embed_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embed_inflight: Dict[str, asyncio.Task] = {}
         self.collection_name = "documents"
         self._ensure_collection()
     
     def _ensure_collection(self):
         """Ensure the collection exists."""
         try:
-            collections = self.qdrant_client.get_collections()
-            if self.collection_name not in [c.name for c in collections.collections]:
+            if not self.qdrant_client.collection_exists(self.collection_name):
                 self.qdrant_client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(
@@ -32,22 +62,87 @@ class VectorStore:
                     )
                 )
         except Exception as e:
-            print(f"Warning: Could not ensure collection exists: {e}")
+            logger.warning("Could not ensure collection exists: %s", e)
     
-    async def embed_text(self, text: str) -> List[float]:
-        """Get embeddings for text using the embeddings service."""
+    async def embed_texts(self, texts: List[str]) -> List[np.ndarray]:
+        """Get float32 embeddings for several texts in a single request."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.embed_url}/embed",
-                    json={"inputs": [text]}
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["data"][0]["embedding"]
+            response = await self._http.post(
+                "/embed",
+                json={"inputs": texts}
+            )
+            response.raise_for_status()
+            result = msgspec.json.decode(response.content, type=EmbedResponse)
+            return [
+                np.asarray(item.embedding, dtype=np.float32)
+                for item in result.data
+            ]
         except Exception as e:
             raise Exception(f"Embedding failed: {e}")
     
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Get embeddings for text, batched with concurrent callers."""
+        if self._embed_worker is None:
+            self._embed_queue = asyncio.Queue()
+            self._embed_worker = asyncio.create_task(self._embed_batches())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._embed_queue.put_nowait((text, future))
+        return await future
+    
+    async def _embed_batches(self):
+        """Drain queued texts in micro-batches and resolve each caller."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._embed_queue.get()]
+            deadline = loop.time() + EMBED_MAX_WAIT
+            while len(batch) < EMBED_MAX_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._embed_queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                embeddings = await self.embed_texts([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+    
+    async def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query, reusing cached and in-flight results."""
+        cached = self._embed_cache.get(query)
+        if cached is not None:
+            self._embed_cache.move_to_end(query)
+            return cached
+        
+        # Concurrent misses for the same query share a single request
+        task = self._embed_inflight.get(query)
+        if task is None:
+            task = asyncio.ensure_future(self.embed_text(query))
+            self._embed_inflight[query] = task
+            task.add_done_callback(lambda t: self._cache_query_embedding(query, t))
+        return await asyncio.shield(task)
+    
+    def _cache_query_embedding(self, query: str, task: asyncio.Task):
+        """Store a finished query embedding, evicting the oldest entry."""
+        self._embed_inflight.pop(query, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._embed_cache[query] = task.result()
+        if len(self._embed_cache) > EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+    
     async def add_document(
         self,
         document_id: str,
@@ -60,7 +155,7 @@ class VectorStore:
             
             point = PointStruct(
                 id=document_id,
-                vector=embedding,
+                vector=embedding.tolist(),
                 payload={
                     "text": text,
                     "metadata": metadata or {}
@@ -78,36 +173,65 @@ class VectorStore:
         self,
         query: str,
         limit: int = 5,
-        score_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
-        """Search for similar documents."""
+        score_threshold: float = 0.7,
+        with_payload: Any = ("text",),
+        with_vectors: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Search for similar documents.
+        
+        Only the requested payload fields are fetched from Qdrant, and each
+        hit carries a ``metadata`` key only when it was requested. Results are
+        yielded lazily; callers that need a list wrap them in ``list()``.
+        """
         try:
-            query_embedding = await self.embed_text(query)
+            query_embedding = await self._embed_query(query)
             
+            if isinstance(with_payload, tuple):
+                with_payload = list(with_payload)
             results = self.qdrant_client.search(
                 collection_name=self.collection_name,
                 query_vector=query_embedding,
                 limit=limit,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                with_payload=with_payload,
+                with_vectors=with_vectors
             )
-            
-            return [
-                {
-                    "id": result.id,
-                    "score": result.score,
-                    "text": result.payload["text"],
-                    "metadata": result.payload.get("metadata", {})
-                }
-                for result in results
-            ]
         except Exception as e:
             raise Exception(f"Search failed: {e}")
+        
+        return (self._search_hit(result) for result in results)
+    
+    @staticmethod
+    def _search_hit(result) -> Dict[str, Any]:
+        """Build a search hit from the payload fields Qdrant returned."""
+        payload = result.payload or {}
+        hit = {
+            "id": result.id,
+            "score": result.score,
+            "text": payload.get("text")
+        }
+        if "metadata" in payload:
+            hit["metadata"] = payload["metadata"]
+        return hit
     
     async def health_check(self) -> bool:
         """Check if Qdrant is healthy."""
         try:
-            collections = self.qdrant_client.get_collections()
+            # The client call is blocking; run it off the loop so callers'
+            # timeouts can fire and a hung Qdrant doesn't stall other requests
+            await asyncio.to_thread(self.qdrant_client.get_collections)
             return True
         except Exception:
             return False
+    
+    async def aclose(self):
+        """Stop the embedding batcher and close the embeddings HTTP client."""
+        if self._embed_worker is not None:
+            self._embed_worker.cancel()
+        await self._http.aclose()
+
 
+@lru_cache(maxsize=None)
+def get_vector_store() -> VectorStore:
+    """Get the process-wide VectorStore, creating it on first use."""
+    return VectorStore()
@@ -5,9 +5,14 @@ import asyncio
 import json
 import sys
 import time
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 import httpx
 
+try:
+    import uvloop
+except ImportError:  # optional; fall back to the default asyncio loop
+    uvloop = None
+
 
 class HealthChecker:
     """Health checker for all services."""
@@ -20,7 +25,10 @@ class HealthChecker:
             "langfuse": "http://localhost:3000",
             "orchestrator": "http://localhost:8001"
         }
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self.client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=5)
+        )
     
     async def check_vllm(self) -> Dict[str, Any]:
         """Check vLLM service health."""
@@ -102,9 +110,11 @@ class HealthChecker:
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
     
-    async def run_health_check(self) -> Dict[str, Any]:
-        """Run comprehensive health check."""
-        print("🔍 Running health check...")
+    async def run_health_check(self, lines: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run comprehensive health check, appending report lines to ``lines``."""
+        if lines is None:
+            lines = []
+        lines.append("🔍 Running health check...")
         
         checks = {
             "vllm": self.check_vllm(),
@@ -114,16 +124,19 @@ class HealthChecker:
             "orchestrator": self.check_orchestrator()
         }
         
+        # All checks are independent, so run them concurrently
+        check_results = await asyncio.gather(*checks.values(), return_exceptions=True)
+        
         results = {}
-        for service, check_coro in checks.items():
-            print(f"  Checking {service}...", end=" ")
-            result = await check_coro
+        for service, result in zip(checks.keys(), check_results):
+            if isinstance(result, Exception):
+                result = {"status": "unhealthy", "error": str(result)}
             results[service] = result
             
             if result["status"] == "healthy":
-                print("✅")
+                lines.append(f"  Checking {service}... ✅")
             else:
-                print(f"❌ ({result.get('error', 'Unknown error')})")
+                lines.append(f"  Checking {service}... ❌ ({result.get('error', 'Unknown error')})")
         
         # Overall status
         all_healthy = all(r["status"] == "healthy" for r in results.values())
@@ -142,43 +155,48 @@ class HealthChecker:
 async def main():
     """Main function."""
     checker = HealthChecker()
+    # Report lines are buffered and written in one go once the run finishes
+    lines: List[str] = []
+    exit_code = 1
     
     try:
-        results = await checker.run_health_check()
+        results = await checker.run_health_check(lines)
         
-        print("\n📊 Health Check Summary:")
-        print("=" * 50)
+        lines.append("\n📊 Health Check Summary:")
+        lines.append("=" * 50)
         
         for service, result in results.items():
             if service == "overall":
                 continue
                 
             status_icon = "✅" if result["status"] == "healthy" else "❌"
-            print(f"{status_icon} {service.upper()}: {result['status']}")
+            lines.append(f"{status_icon} {service.upper()}: {result['status']}")
             
             if result["status"] == "healthy" and "response_time" in result:
-                print(f"   Response time: {result['response_time']:.3f}s")
+                lines.append(f"   Response time: {result['response_time']:.3f}s")
             elif result["status"] == "unhealthy":
-                print(f"   Error: {result.get('error', 'Unknown')}")
+                lines.append(f"   Error: {result.get('error', 'Unknown')}")
         
-        print(f"\n🎯 Overall Status: {results['overall']['status'].upper()}")
+        lines.append(f"\n🎯 Overall Status: {results['overall']['status'].upper()}")
         
         # Exit with appropriate code
         if results["overall"]["status"] == "healthy":
-            sys.exit(0)
-        else:
-            sys.exit(1)
+            exit_code = 0
             
     except KeyboardInterrupt:
-        print("\n⚠️  Health check interrupted")
-        sys.exit(1)
+        lines.append("\n⚠️  Health check interrupted")
     except Exception as e:
-        print(f"\n💥 Health check failed: {e}")
-        sys.exit(1)
+        lines.append(f"\n💥 Health check failed: {e}")
     finally:
         await checker.close()
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
 
@@ -5,300 +5,341 @@ import asyncio
 import json
 import sys
 import time
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # optional; fall back to the default asyncio loop
+    uvloop = None
+
+# Service endpoints
+VLLM_URL = "http://localhost:8000"
+EMBEDDINGS_URL = "http://localhost:8081"
+QDRANT_URL = "http://localhost:6333"
+ORCHESTRATOR_URL = "http://localhost:8001"
+
+VLLM_CHAT_URL = f"{VLLM_URL}/v1/chat/completions"
+EMBED_URL = f"{EMBEDDINGS_URL}/embed"
+QDRANT_COLLECTIONS_URL = f"{QDRANT_URL}/collections"
+ORCHESTRATOR_CHAT_URL = f"{ORCHESTRATOR_URL}/chat"
+TOOLS_EXECUTE_URL = f"{ORCHESTRATOR_URL}/tools/execute"
+CHAT_COMPLETIONS_URL = f"{ORCHESTRATOR_URL}/chat/completions"
+WARMUP_URLS = (
+    f"{VLLM_URL}/health",
+    f"{EMBEDDINGS_URL}/health",
+    f"{QDRANT_URL}/",
+    f"{ORCHESTRATOR_URL}/health"
+)
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Upper bound on the end_to_end response body; a runaway generation fails
+# the test instead of being buffered whole.
+END_TO_END_MAX_BODY = 1 << 20
+
+# Localhost connects should be instant, so only reads get a long budget;
+# end_to_end runs the tool loop and gets a longer read still.
+DEFAULT_TIMEOUT = httpx.Timeout(connect=1.0, read=30.0, write=2.0, pool=1.0)
+END_TO_END_TIMEOUT = httpx.Timeout(connect=1.0, read=120.0, write=2.0, pool=1.0)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _shorten(text: str, limit: int) -> str:
+    """Truncate ``text`` to ``limit`` characters, marking the cut with '...'."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 
 class SmokeTester:
     """Smoke tester for the local LLM stack."""
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._client = None
         self.tests = []
-    
-    async def test_vllm_basic(self) -> Dict[str, Any]:
-        """Test basic vLLM functionality."""
-        print("🧪 Testing vLLM basic functionality...")
-        
-        try:
-            payload = {
+        # Request bodies never change, so they are serialized once up front
+        self._payloads = {
+            "vllm": _dumps({
                 "model": "Qwen/Qwen2.5-14B-Instruct-AWQ",
                 "messages": [{"role": "user", "content": "Hello, respond with just 'ping'"}],
                 "max_tokens": 10,
                 "temperature": 0.1
-            }
-            
-            response = await self.client.post(
-                "http://localhost:8000/v1/chat/completions",
-                json=payload
+            }),
+            "embeddings": _dumps({
+                "inputs": ["This is a test sentence for embeddings."]
+            }),
+            "orchestrator_chat": _dumps({
+                "message": "Hello, can you help me test the system?"
+            }),
+            "tool_execution": _dumps({
+                "tool_name": "get_map",
+                "arguments": {"key": "boost_target"}
+            }),
+            "end_to_end": _dumps({
+                "messages": [
+                    {"role": "user", "content": "Can you get the boost_target map data and summarize any anomalies?"}
+                ],
+                "model": "Qwen/Qwen2.5-14B-Instruct-AWQ",
+                "temperature": 0.7
+            })
+        }
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=DEFAULT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0
+                )
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                content = data["choices"][0]["message"]["content"].strip()
-                
-                return {
-                    "status": "passed",
-                    "response": content,
-                    "response_time": response.elapsed.total_seconds(),
-                    "tokens": data.get("usage", {}).get("total_tokens", 0)
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+        return self._client
     
-    async def test_embeddings(self) -> Dict[str, Any]:
-        """Test embeddings service."""
-        print("🧪 Testing embeddings service...")
+    async def _warmup(self):
+        """Open a pooled connection to every service before the real tests."""
+        await asyncio.gather(
+            *(self.client.get(url, timeout=5.0) for url in WARMUP_URLS),
+            return_exceptions=True
+        )
+    
+    async def _run(
+        self,
+        url: str,
+        body: Optional[bytes],
+        extract: Callable[[Dict[str, Any]], Dict[str, Any]],
+        max_body: Optional[int] = None,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Issue one request (GET when ``body`` is None) and build its result.
         
+        ``extract`` pulls the test-specific fields out of the decoded response.
+        The body is streamed in and, if ``max_body`` is set, the test fails as
+        soon as it grows past that many bytes.
+        """
+        method = "GET" if body is None else "POST"
+        headers = None if body is None else JSON_HEADERS
         try:
-            payload = {
-                "inputs": ["This is a test sentence for embeddings."]
-            }
-            
-            response = await self.client.post(
-                "http://localhost:8081/embed",
-                json=payload
-            )
+            start = time.perf_counter_ns()
+            async with self.client.stream(
+                method, url, content=body, headers=headers, timeout=timeout
+            ) as response:
+                content = bytearray()
+                async for chunk in response.aiter_bytes():
+                    content += chunk
+                    if max_body is not None and len(content) > max_body:
+                        return {
+                            "status": "failed",
+                            "error": f"Response body exceeded {max_body} bytes"
+                        }
+            elapsed = (time.perf_counter_ns() - start) / 1e9
             
-            if response.status_code == 200:
-                data = response.json()
-                embedding = data["data"][0]["embedding"]
-                
-                return {
-                    "status": "passed",
-                    "embedding_size": len(embedding),
-                    "response_time": response.elapsed.total_seconds()
-                }
-            else:
+            if not response.is_success:
                 return {
                     "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
+                    "error": f"HTTP {response.status_code}: {content.decode('utf-8', 'replace')}"
                 }
-                
-        except Exception as e:
+            
+            result = extract(_loads(content))
+            result["status"] = "passed"
+            result["response_time"] = elapsed
+            result["http_version"] = response.http_version
+            return result
+        except (httpx.HTTPError, json.JSONDecodeError, KeyError, IndexError, TypeError) as e:
             return {
                 "status": "failed",
                 "error": str(e)
             }
     
+    async def test_vllm_basic(self) -> Dict[str, Any]:
+        """Test basic vLLM functionality."""
+        return await self._run(
+            VLLM_CHAT_URL,
+            self._payloads["vllm"],
+            lambda data: {
+                "response": data["choices"][0]["message"]["content"].strip(),
+                "tokens": data.get("usage", {}).get("total_tokens", 0)
+            }
+        )
+    
+    async def test_embeddings(self) -> Dict[str, Any]:
+        """Test embeddings service."""
+        return await self._run(
+            EMBED_URL,
+            self._payloads["embeddings"],
+            lambda data: {"embedding_size": len(data["data"][0]["embedding"])}
+        )
+    
     async def test_qdrant(self) -> Dict[str, Any]:
         """Test Qdrant vector database."""
-        print("🧪 Testing Qdrant...")
-        
-        try:
-            # Test collections endpoint
-            response = await self.client.get("http://localhost:6333/collections")
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "passed",
-                    "collections": len(data.get("collections", [])),
-                    "response_time": response.elapsed.total_seconds()
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+        # Test collections endpoint
+        return await self._run(
+            QDRANT_COLLECTIONS_URL,
+            None,
+            lambda data: {"collections": len(data.get("collections", []))}
+        )
     
     async def test_orchestrator_chat(self) -> Dict[str, Any]:
         """Test orchestrator chat functionality."""
-        print("🧪 Testing orchestrator chat...")
-        
-        try:
-            payload = {
-                "message": "Hello, can you help me test the system?"
-            }
-            
-            response = await self.client.post(
-                "http://localhost:8001/chat",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "passed",
-                    "response": data.get("response", "")[:100] + "..." if len(data.get("response", "")) > 100 else data.get("response", ""),
-                    "response_time": response.elapsed.total_seconds()
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+        return await self._run(
+            ORCHESTRATOR_CHAT_URL,
+            self._payloads["orchestrator_chat"],
+            lambda data: {"response": _shorten(data.get("response") or "", 100)}
+        )
     
     async def test_tool_execution(self) -> Dict[str, Any]:
         """Test tool execution through orchestrator."""
-        print("🧪 Testing tool execution...")
-        
-        try:
-            payload = {
-                "tool_name": "get_map",
-                "arguments": {"key": "boost_target"}
-            }
-            
-            response = await self.client.post(
-                "http://localhost:8001/tools/execute",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "status": "passed",
-                    "result": data.get("result", {}),
-                    "response_time": response.elapsed.total_seconds()
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "status": "failed",
-                "error": str(e)
-            }
+        return await self._run(
+            TOOLS_EXECUTE_URL,
+            self._payloads["tool_execution"],
+            lambda data: {"result": data.get("result", {})}
+        )
     
     async def test_end_to_end(self) -> Dict[str, Any]:
         """Test end-to-end workflow with tool calling."""
-        print("🧪 Testing end-to-end workflow...")
-        
-        try:
-            payload = {
-                "messages": [
-                    {"role": "user", "content": "Can you get the boost_target map data and summarize any anomalies?"}
-                ],
-                "model": "Qwen/Qwen2.5-14B-Instruct-AWQ",
-                "temperature": 0.7
-            }
-            
-            response = await self.client.post(
-                "http://localhost:8001/chat/completions",
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                content = data["choices"][0]["message"]["content"]
-                
-                return {
-                    "status": "passed",
-                    "response": content[:200] + "..." if len(content) > 200 else content,
-                    "response_time": response.elapsed.total_seconds(),
-                    "has_tool_calls": "tool_calls" in data["choices"][0]["message"]
-                }
-            else:
-                return {
-                    "status": "failed",
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-                
-        except Exception as e:
+        def extract(data: Dict[str, Any]) -> Dict[str, Any]:
+            message = data["choices"][0]["message"]
             return {
-                "status": "failed",
-                "error": str(e)
+                "response": _shorten(message["content"] or "", 200),
+                "has_tool_calls": "tool_calls" in message
             }
+        
+        return await self._run(
+            CHAT_COMPLETIONS_URL,
+            self._payloads["end_to_end"],
+            extract,
+            max_body=END_TO_END_MAX_BODY,
+            timeout=END_TO_END_TIMEOUT
+        )
     
-    async def run_smoke_tests(self) -> Dict[str, Any]:
-        """Run all smoke tests."""
-        print("🚀 Starting smoke tests...")
-        print("=" * 50)
+    async def run_smoke_tests(self, lines: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run all smoke tests, appending report lines to ``lines``."""
+        if lines is None:
+            lines = []
+        lines.append("🚀 Starting smoke tests...")
+        lines.append("=" * 50)
+        
+        await self._warmup()
+        
+        # Independent services are tested concurrently; end_to_end depends on
+        # vLLM and the orchestrator, so it runs as a second stage.
+        independent = {
+            "vllm_basic": self.test_vllm_basic(),
+            "embeddings": self.test_embeddings(),
+            "qdrant": self.test_qdrant(),
+            "orchestrator_chat": self.test_orchestrator_chat(),
+            "tool_execution": self.test_tool_execution()
+        }
+        
+        stage_results = await asyncio.gather(*independent.values(), return_exceptions=True)
+        test_results = dict(zip(independent.keys(), stage_results))
         
-        tests = [
-            ("vllm_basic", self.test_vllm_basic()),
-            ("embeddings", self.test_embeddings()),
-            ("qdrant", self.test_qdrant()),
-            ("orchestrator_chat", self.test_orchestrator_chat()),
-            ("tool_execution", self.test_tool_execution()),
-            ("end_to_end", self.test_end_to_end())
+        # Don't wait out a full timeout when a dependency is already known bad
+        failed_deps = [
+            name for name in ("vllm_basic", "orchestrator_chat")
+            if isinstance(test_results[name], Exception) or test_results[name]["status"] != "passed"
         ]
+        if failed_deps:
+            test_results["end_to_end"] = {
+                "status": "skipped",
+                "error": f"Depends on failed test(s): {', '.join(failed_deps)}"
+            }
+        else:
+            test_results["end_to_end"] = await self.test_end_to_end()
         
         results = {}
         passed = 0
-        total = len(tests)
+        total = len(test_results)
         
-        for test_name, test_coro in tests:
-            print(f"\n📋 Running {test_name}...")
-            result = await test_coro
+        for test_name, result in test_results.items():
+            if isinstance(result, Exception):
+                result = {"status": "failed", "error": str(result)}
             results[test_name] = result
             
+            lines.append(f"\n📋 {test_name}:")
             if result["status"] == "passed":
                 passed += 1
-                print(f"✅ {test_name}: PASSED")
+                lines.append(f"✅ {test_name}: PASSED")
                 if "response_time" in result:
-                    print(f"   Response time: {result['response_time']:.3f}s")
+                    lines.append(f"   Response time: {result['response_time']:.3f}s")
+                if "http_version" in result:
+                    lines.append(f"   Protocol: {result['http_version']}")
+            elif result["status"] == "skipped":
+                lines.append(f"⏭️  {test_name}: SKIPPED")
+                lines.append(f"   Reason: {result.get('error', 'Unknown')}")
             else:
-                print(f"❌ {test_name}: FAILED")
-                print(f"   Error: {result.get('error', 'Unknown error')}")
+                lines.append(f"❌ {test_name}: FAILED")
+                lines.append(f"   Error: {result.get('error', 'Unknown error')}")
         
         # Summary
-        print("\n" + "=" * 50)
-        print("📊 Smoke Test Summary:")
-        print(f"   Passed: {passed}/{total}")
-        print(f"   Success Rate: {(passed/total)*100:.1f}%")
+        lines.append("\n" + "=" * 50)
+        lines.append("📊 Smoke Test Summary:")
+        lines.append(f"   Passed: {passed}/{total}")
+        lines.append(f"   Success Rate: {(passed/total)*100:.1f}%")
         
         if passed == total:
-            print("🎉 All tests passed! System is ready.")
+            lines.append("🎉 All tests passed! System is ready.")
             results["overall"] = {"status": "passed", "passed": passed, "total": total}
         else:
-            print("⚠️  Some tests failed. Check the logs above.")
+            lines.append("⚠️  Some tests failed. Check the logs above.")
             results["overall"] = {"status": "failed", "passed": passed, "total": total}
         
         return results
     
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP client, if one was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 async def main():
     """Main function."""
     tester = SmokeTester()
+    # Report lines are buffered and written in one go once the run finishes
+    lines: List[str] = []
+    exit_code = 1
     
     try:
-        results = await tester.run_smoke_tests()
+        results = await tester.run_smoke_tests(lines)
         
         # Exit with appropriate code
         if results["overall"]["status"] == "passed":
-            sys.exit(0)
-        else:
-            sys.exit(1)
+            exit_code = 0
             
     except KeyboardInterrupt:
-        print("\n⚠️  Smoke tests interrupted")
-        sys.exit(1)
+        lines.append("\n⚠️  Smoke tests interrupted")
     except Exception as e:
-        print(f"\n💥 Smoke tests failed: {e}")
-        sys.exit(1)
+        lines.append(f"\n💥 Smoke tests failed: {e}")
     finally:
         await tester.close()
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
 
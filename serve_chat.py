@@ -4,8 +4,9 @@ Simple HTTP server to serve the chat interface HTML file
 """
 
 import http.server
-import socketserver
 import os
+import signal
+import socket
 import sys
 from pathlib import Path
 
@@ -13,33 +14,127 @@ from pathlib import Path
 HOST = "192.168.1.30"
 PORT = 9090  # Different port to avoid conflicts
 CHAT_FILE = "chat_interface.html"
+# Worker processes, each accepting on its own SO_REUSEPORT socket
+WORKERS = int(os.getenv("CHAT_WORKERS", str(os.cpu_count() or 1)))
+
+# Contents of CHAT_FILE, read once in main() and served from memory.
+# CHAT_CACHE=0 serves the file from disk instead so edits show up live.
+CACHE_HTML = os.getenv("CHAT_CACHE", "1") != "0"
+CACHED_HTML = b""
 
 class ChatHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler to serve the chat interface."""
     
+    # Keep browser connections alive between requests
+    protocol_version = "HTTP/1.1"
+    
+    # CORS headers never change, so they are encoded once
+    _CORS_BLOB = (
+        b"Access-Control-Allow-Origin: *\r\n"
+        b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        b"Access-Control-Allow-Headers: Content-Type\r\n"
+    )
+    
     def do_GET(self):
-        """Handle GET requests."""
-        if self.path == "/" or self.path == "/chat":
-            # Serve the chat interface
+        """Handle GET requests; every path serves the chat interface."""
+        if not CACHE_HTML:
             self.path = f"/{CHAT_FILE}"
-        elif self.path == f"/{CHAT_FILE}":
-            # Serve the chat interface file
-            pass
-        else:
-            # For any other path, serve the chat interface
+            return super().do_GET()
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(CACHED_HTML)))
+        self.send_header("Cache-Control", "public, max-age=300")
+        self.end_headers()
+        self.wfile.write(CACHED_HTML)
+    
+    def do_HEAD(self):
+        """Handle HEAD requests."""
+        if not CACHE_HTML:
             self.path = f"/{CHAT_FILE}"
+            return super().do_HEAD()
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(CACHED_HTML)))
+        self.end_headers()
+    
+    def copyfile(self, source, outputfile):
+        """Send the file with os.sendfile, falling back to a userspace copy."""
+        try:
+            in_fd = source.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        if not hasattr(os, "sendfile"):
+            return super().copyfile(source, outputfile)
         
-        return super().do_GET()
+        out_fd = self.connection.fileno()
+        offset = 0
+        size = os.fstat(in_fd).st_size
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
     
     def end_headers(self):
         """Add CORS headers to allow cross-origin requests."""
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        if self.request_version != "HTTP/0.9":
+            if not hasattr(self, "_headers_buffer"):
+                self._headers_buffer = []
+            self._headers_buffer.append(self._CORS_BLOB)
         super().end_headers()
 
+class ChatHTTPServer(http.server.ThreadingHTTPServer):
+    """Threaded server whose socket can be shared across worker processes."""
+    
+    allow_reuse_address = True
+    
+    def server_bind(self):
+        """Bind with SO_REUSEPORT so the kernel balances accepts across workers."""
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+    
+    # Set in forked workers so they exit once the parent process is gone
+    parent_pid = None
+    
+    def service_actions(self):
+        """Stop a forked worker whose parent has died (checked every poll)."""
+        if self.parent_pid is not None and os.getppid() != self.parent_pid:
+            raise SystemExit(0)
+
+def serve_worker(parent_pid):
+    """Run a silent worker server in a forked child process."""
+    try:
+        with ChatHTTPServer((HOST, PORT), ChatHTTPRequestHandler) as httpd:
+            httpd.parent_pid = parent_pid
+            httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os._exit(0)
+
+def stop_workers(children):
+    """Terminate the forked workers and reap them."""
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+def handle_sigterm(signum, frame):
+    """Unwind the parent on SIGTERM so its workers get cleaned up."""
+    raise SystemExit(0)
+
 def main():
     """Start the HTTP server."""
+    global CACHED_HTML
     # Change to the directory containing the chat interface
     script_dir = Path(__file__).parent
     os.chdir(script_dir)
@@ -50,24 +145,44 @@ def main():
         print("Please make sure the chat interface file exists.")
         sys.exit(1)
     
-    # Create the server
-    with socketserver.TCPServer((HOST, PORT), ChatHTTPRequestHandler) as httpd:
-        print(f"🌐 Chat Interface Server")
-        print(f"======================================")
-        print(f"📍 Host: {HOST}")
-        print(f"🔌 Port: {PORT}")
-        print(f"📄 Serving: {CHAT_FILE}")
-        print(f"🌍 Access URL: http://{HOST}:{PORT}")
-        print(f"")
-        print(f"✅ Server is running...")
-        print(f"Press Ctrl+C to stop")
-        print(f"")
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print(f"\n🛑 Server stopped by user")
-            httpd.shutdown()
+    CACHED_HTML = Path(CHAT_FILE).read_bytes()
+    
+    # Fork the extra workers; the parent serves too and prints the banner
+    workers = WORKERS if hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT") else 1
+    parent_pid = os.getpid()
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            serve_worker(parent_pid)
+        children.append(pid)
+    
+    # start_chat.sh runs this in the background, where SIGINT is ignored,
+    # so SIGTERM is how it gets stopped
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    try:
+        # Create the server
+        with ChatHTTPServer((HOST, PORT), ChatHTTPRequestHandler) as httpd:
+            print(f"🌐 Chat Interface Server")
+            print(f"======================================")
+            print(f"📍 Host: {HOST}")
+            print(f"🔌 Port: {PORT}")
+            print(f"📄 Serving: {CHAT_FILE}")
+            print(f"👷 Workers: {workers}")
+            print(f"🌍 Access URL: http://{HOST}:{PORT}")
+            print(f"")
+            print(f"✅ Server is running...")
+            print(f"Press Ctrl+C to stop")
+            print(f"")
+            
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                print(f"\n🛑 Server stopped by user")
+                httpd.shutdown()
+    finally:
+        stop_workers(children)
 
 if __name__ == "__main__":
     main()